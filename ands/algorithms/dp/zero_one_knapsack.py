@@ -8,7 +8,7 @@ Author: Nelson Brochado
 
 Created: 15/08/2015
 
-Updated: 07/03/2018
+Updated: 15/10/2026
 
 # Description
 
@@ -20,31 +20,34 @@ Knapsack has capacity W. Goal: fill knapsack so as to maximize total value.
 - Slides by prof. Evanthia Papadopoulou
 """
 
-__all__ = ["zero_one_knapsack", "recursive_01_knapsack",
-           "memoized_01_knapsack"]
+__all__ = ["zero_one_knapsack", "zero_one_knapsack_bitset",
+           "recursive_01_knapsack", "memoized_01_knapsack"]
 
+import sys
 
-def _get_zero_one_knapsack_matrix(total_weight: int, n: int) -> list:
-    """Returns a matrix for a dynamic programming solution to the 0/1 knapsack
-    problem.
+import numpy as np
 
-    The first row of this matrix contains the numbers corresponding to the
-    weights of the (sub)problems. The first column contains an enumeration of
-    the items, starting from the fact that we could not include any item, and
-    this is represented with a 0.
 
-    m[0][0] is 0 just because of the alignment, it does make any logical sense
-    for this purpose, it could be None, or any other value."""
-    m = [[0 for _ in range(total_weight + 2)] for _ in range(n + 2)]
+def _get_profits_dtype(values: list) -> type:
+    """Returns the dtype of the profits of zero_one_knapsack, given the values
+    of the items.
 
-    for x in range(1, total_weight + 2):
-        m[0][x] = x - 1
+    If all values are integers, then every profit (or profit of including an
+    item) is at least the smallest value, or 0, and at most the sum of the
+    positive values, so the narrowest integer dtype which holds both bounds is
+    returned, so that the profits take as little memory as possible. The
+    bounds are computed with Python ints, which cannot overflow.
 
-    for j in range(1, n + 2):
-        m[j][0] = j - 1
-        m[j][1] = 0
-
-    return m
+    Otherwise (e.g. if some values are floats), or if the bounds do not even
+    fit into an int64, then the profits are kept as Python objects."""
+    if all(isinstance(v, (int, np.integer)) for v in values):
+        max_profit = sum(int(v) for v in values if v > 0)
+        min_profit = min([0] + [int(v) for v in values])
+        for dtype in (np.int16, np.int32, np.int64):
+            info = np.iinfo(dtype)
+            if info.min <= min_profit and max_profit <= info.max:
+                return dtype
+    return object
 
 
 def zero_one_knapsack(total_weight: int, weights: list, values: list) -> int:
@@ -53,111 +56,200 @@ def zero_one_knapsack(total_weight: int, weights: list, values: list) -> int:
 
     This version does not tell which items to pick.
 
+    The weights are assumed to be integers, whereas the values can also be,
+    for example, floats.
+
     Time complexity: O(n * total_weight), where n is the number of items.
     This is consider a pseudo-polynomial time algorithm, not polynomial!
 
     The decision version of this problem is actually NP-Complete,
     and the running time complexity above does not contradict it:
-    total_weight is not polynomial in the length of the input."""
+    total_weight is not polynomial in the length of the input.
+
+    Space complexity: O(total_weight)."""
     assert len(weights) == len(values)
     assert total_weight >= 0
 
-    n = len(weights)
-
-    profits = _get_zero_one_knapsack_matrix(total_weight, n)
+    # Items which are heavier than total_weight do not fit in any knapsack of
+    # capacity at most total_weight, and items whose value is not positive
+    # never increase a profit, so none of them can change any of the profits.
+    # NumPy integer values are converted to Python ints, so that their sums
+    # cannot wrap around.
+    items = [(w, int(v) if isinstance(v, np.integer) else v)
+             for w, v in zip(weights, values) if w <= total_weight and v > 0]
+
+    # If all items fit together in the knapsack, then we simply take them all.
+    # This includes the case where there are no items.
+    if sum(w for w, _ in items) <= total_weight:
+        return sum(v for _, v in items)
+
+    # For integer values, this is the narrowest integer type which holds all
+    # profits, which reduces the memory which needs to be read and written per
+    # item.
+    dtype = _get_profits_dtype([v for _, v in items])
+
+    # profits[w] is the maximum profit that can be obtained with a knapsack of
+    # capacity w, using only the items considered so far. We only need to keep
+    # one row of the classical (n + 1) x (total_weight + 1) matrix.
+    profits = np.zeros(total_weight + 1, dtype=dtype)
+
+    # Buffer which holds the profits of including the current item. It is
+    # allocated only once, so that no temporary array is created per item.
+    taken = np.empty(total_weight + 1, dtype=dtype)
+
+    # Only the profits of the capacities 0, ..., reachable are kept up to date,
+    # where reachable is the sum of the weights of the items considered so far
+    # (but at most total_weight): every capacity c > reachable can hold all
+    # these items, so its profit is equal to profits[reachable]. This way, the
+    # first items only touch a small prefix of profits.
+    reachable = 0
 
     # Iterating through the items.
-    for i in range(2, n + 2):
-
-        # Iterating through the weights.
-        for w in range(2, total_weight + 2):
-
-            # If the weight of the (i - 2)th item is greater than w - 1, which
-            # is the current weight being analysed.
-            # Note: the weights in the matrix profits are shifted to the right
-            # by 1.
-            if weights[i - 2] > w - 1:
-                profits[i][w] = profits[i - 1][w]
-            else:
-                # Note: indices in the profits matrix are also shifted 2
-                # positions to the bottom.
-
-                # The weight of the current item is less (or equal) than the
-                # total weight, but we need to decide if it is convenient to
-                # include this item or not. To do this, we compare if we gain
-                # more by including it or not.
-
-                # profits[i - 1][w]: profit of not including current item.
-                # values[i - 2]: value of the current item.
-                # w - weights[i - 2]: remaining weight, if we include the
-                # current item.
-                # Note: weights[i - 2] is the weight of the current item.
-                profits[i][w] = max(profits[i - 1][w],
-                                    values[i - 2] +
-                                    profits[i - 1][w - weights[i - 2]])
-
-    return profits[-1][-1]
-
-
-def _recursive_01_knapsack_aux(capacity: int,
-                               w: list,
-                               v: list,
-                               value: int) -> int:
-    """Either takes the last element or it doesn't.
+    for w, v in items:
+        top = min(total_weight, reachable + w)
+        profits[reachable + 1:top + 1] = profits[reachable]
+
+        # For every capacity w <= c <= top, we decide if it is convenient to
+        # include the current item or not, i.e. we compare profits[c] (the
+        # profit of not including it) with v + profits[c - w] (the profit of
+        # including it). The profits of including it are computed into taken
+        # before profits is updated, so profits[c - w] still refers to the
+        # previous row.
+        k = top + 1 - w
+        np.add(profits[:k], v, out=taken[:k])
+        np.maximum(profits[w:top + 1], taken[:k], out=profits[w:top + 1])
+
+        reachable = top
+
+    # NumPy integers are converted back to Python ints, whereas objects are
+    # already of the type of the values.
+    best = profits[reachable]
+    return best if dtype is object else int(best)
+
+
+def zero_one_knapsack_bitset(total_weight: int, weights: list) -> int:
+    """Returns the maximum total weight, not greater than total_weight, which
+    can be obtained by using items with the given weights.
+
+    This is the special case of the 0/1 knapsack problem where the value of
+    each item is equal to its weight (which is also the optimization version of
+    the subset-sum problem).
+
+    The set of reachable total weights is represented as the bits of a Python
+    int, where the bit at position w is 1 if and only if w is a reachable total
+    weight. Including an item of weight wᵢ corresponds to shifting all bits wᵢ
+    positions to the left, hence each item is processed with a single shift and
+    a single bitwise or, which operate on whole machine words at a time.
+
+    Time complexity: O(n * total_weight / b), where n is the number of items
+    and b is the number of bits of a machine word."""
+    assert total_weight >= 0
+
+    # Only the bits at positions 0, ..., total_weight are of interest.
+    mask = (1 << (total_weight + 1)) - 1
+
+    # Initially, only the total weight 0 is reachable.
+    reachable = 1
+
+    for w in weights:
+        reachable |= (reachable << w) & mask
+
+    return reachable.bit_length() - 1
+
+
+def _recursive_01_knapsack_aux(capacity: int, w: list, v: list, k: int) -> int:
+    """Either takes the kth item or it doesn't, where only the first k items
+    are considered.
+
+    The considered items are identified by k, rather than by slicing w and v,
+    so that no list is copied at each call.
 
     This algorithm takes exponential time."""
-    if capacity == 0:
+    if capacity == 0 or k == 0:
         return 0
-    if len(w) > 0 and len(v) > 0:
-        if w[-1] > capacity:  # We cannot include the nth item.
-            value = _recursive_01_knapsack_aux(capacity, w[:-1], v[:-1], value)
-        else:
-            value = max(
-                v[-1] + _recursive_01_knapsack_aux(capacity - w[-1], w[:-1],
-                                                   v[:-1], value),
-                _recursive_01_knapsack_aux(capacity, w[:-1], v[:-1], value))
-    return value
+
+    # Weight and value of the kth item.
+    wk = w[k - 1]
+    vk = v[k - 1]
+
+    excluded = _recursive_01_knapsack_aux(capacity, w, v, k - 1)
+    if wk > capacity:  # We cannot include the kth item.
+        return excluded
+
+    included = vk + _recursive_01_knapsack_aux(capacity - wk, w, v, k - 1)
+    return included if included > excluded else excluded
 
 
 def recursive_01_knapsack(total_weight: int, weights: list, values: list):
     assert len(weights) == len(values)
     assert total_weight >= 0
 
-    value = 0
-    return _recursive_01_knapsack_aux(total_weight, weights, values, value)
+    return _recursive_01_knapsack_aux(total_weight, weights, values,
+                                      len(weights))
+
 
+# If the number of subproblems of memoized_01_knapsack does not exceed this
+# value, they are all solved bottom-up by zero_one_knapsack.
+_DENSE_STATES_THRESHOLD = 10 ** 7
 
-def _memoized_01_knapsack_aux(capacity: int, w: list, v: list, value: int,
-                              m: list) -> int:
-    """Either takes the last element or it doesn't.
 
-    Memoization version of _recursive_01_knapsack_aux."""
-    if capacity == 0:
+def _memoized_01_knapsack_aux(capacity: int, w: list, v: list, k: int,
+                              m: dict) -> int:
+    """Either takes the kth item or it doesn't, where only the first k items
+    are considered.
+
+    Memoization version of _recursive_01_knapsack_aux.
+
+    m maps the pairs (k, capacity) of the subproblems solved so far to their
+    solutions, so its size is proportional to the number of subproblems which
+    are actually visited, and not to the number of all possible ones."""
+    if capacity == 0 or k == 0:
         return 0
 
-    if m[len(w) - 1][capacity - 1] is not None:
-        return m[len(w) - 1][capacity - 1]
+    value = m.get((k, capacity))
+    if value is not None:
+        return value
 
-    if len(w) > 0 and len(v) > 0:
+    # Weight and value of the kth item.
+    wk = w[k - 1]
+    vk = v[k - 1]
 
-        if w[-1] > capacity:  # We cannot include the nth item.
-            value = _memoized_01_knapsack_aux(capacity, w[:-1], v[:-1], value,
-                                              m)
-        else:
-            value = max(
-                v[-1] + _memoized_01_knapsack_aux(capacity - w[-1], w[:-1],
-                                                  v[:-1], value, m),
-                _memoized_01_knapsack_aux(capacity, w[:-1], v[:-1], value, m))
+    value = _memoized_01_knapsack_aux(capacity, w, v, k - 1, m)
+    if wk <= capacity:  # We can include the kth item.
+        included = vk + _memoized_01_knapsack_aux(capacity - wk, w, v, k - 1,
+                                                  m)
+        if included > value:
+            value = included
 
-    m[len(w) - 1][capacity - 1] = value
+    m[(k, capacity)] = value
 
     return value
 
 
 def memoized_01_knapsack(capacity: int, weights: list, values: list) -> int:
-    result = 0
-    m = [[None for _ in range(capacity)] for _ in range(len(weights))]
-    return _memoized_01_knapsack_aux(capacity, weights, values, result, m)
+    """Returns the maximum profit that can be obtained by using items with
+    weights and values and a knapsack of the given capacity.
+
+    If the number of all possible subproblems, n * capacity, is not too big,
+    they are all solved bottom-up by zero_one_knapsack, which avoids the
+    overhead of a function call per subproblem. Otherwise, only the subproblems
+    which are reachable from the original problem are solved top-down and
+    memoized, which requires memory proportional to their number.
+
+    The top-down solution recurses once per item, so it is not used either if
+    the number of items is not well below the recursion limit.
+
+    Time complexity: O(n * capacity), where n is the number of items."""
+    assert len(weights) == len(values)
+    assert capacity >= 0
+
+    n = len(weights)
+    if (n * capacity <= _DENSE_STATES_THRESHOLD or
+            n > sys.getrecursionlimit() // 2):
+        return zero_one_knapsack(capacity, weights, values)
+
+    return _memoized_01_knapsack_aux(capacity, weights, values, len(weights),
+                                     {})
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ Author: Nelson Brochado
 
 Created: 01/07/2015
 
-Updated: 28/09/2017
+Updated: 15/10/2026
 
 # Description
 
@@ -48,9 +48,21 @@ This is much better than the linear time required to find items by key in an
 
 __all__ = ["BST", "is_bst"]
 
+import heapq
+
 
 class _BSTNode:
-    """Node class to represent a node for the BST class."""
+    """Node class to represent a node for the BST class.
+
+    size is the number of nodes of the subtree rooted at this node (including
+    this node). It is maintained by the BST which contains this node, and thus
+    it is not updated when the children of this node are set manually.
+
+    The attributes are declared in __slots__, so that nodes do not have an
+    instance dictionary, which reduces their memory footprint and speeds up the
+    accesses to their attributes."""
+
+    __slots__ = ("key", "parent", "left", "right", "size")
 
     def __init__(self, key, parent=None, left=None, right=None):
         if key is None:
@@ -59,16 +71,18 @@ class _BSTNode:
         self.parent = parent
         self.left = left
         self.right = right
+        self.size = 1
 
     @property
     def sibling(self) -> "_BSTNode":
         """Returns the sibling node of this node, which can of course be
         None."""
-        if self.parent is not None:
-            if self.is_left_child():
-                return self.parent.right
+        p = self.parent
+        if p is not None:
+            if p.left is self:
+                return p.right
             else:
-                return self.parent.left
+                return p.left
 
     @property
     def grandparent(self) -> "_BSTNode":
@@ -84,26 +98,36 @@ class _BSTNode:
         is returned if it doesn't exist, or the parent or grandparent of this
         node is None."""
 
-        # Implies that also parent is not None.
-        if self.grandparent is not None:
-            if self.parent == self.grandparent.left:
-                return self.grandparent.right
-            else:  # self.parent == self.grandparent.right
-                return self.grandparent.left
+        p = self.parent
+        if p is None:
+            return None
+        gp = p.parent
+        if gp is None:
+            return None
+        return gp.right if p is gp.left else gp.left
 
     def is_left_child(self) -> bool:
-        if self.parent is not None:
-            if self.parent.left is not None:
-                return self.parent.left == self
-        else:
-            raise AttributeError("self does not have a parent")
+        """Returns true if self is the left child of its parent, false
+        otherwise (including when self has no parent)."""
+        p = self.parent
+        return p is not None and p.left is self
 
     def is_right_child(self) -> bool:
-        if self.parent is not None:
-            if self.parent.right is not None:
-                return self.parent.right == self
-        else:
-            raise AttributeError("self does not have a parent")
+        """Returns true if self is the right child of its parent, false
+        otherwise (including when self has no parent)."""
+        p = self.parent
+        return p is not None and p.right is self
+
+    def parent_and_side(self) -> tuple:
+        """Returns the pair (parent, is_left), where parent is the parent of
+        self and is_left is true if self is its left child, so that callers
+        which need both read the parent only once.
+
+        If self has no parent, then (None, False) is returned."""
+        p = self.parent
+        if p is None:
+            return None, False
+        return p, p.left is self
 
     def has_right_child(self) -> bool:
         return self.right is not None
@@ -120,28 +144,26 @@ class _BSTNode:
 
     def has_one_child(self) -> bool:
         """Returns true only if self has exactly one child, false otherwise."""
-        return ((self.left is not None and self.right is None) or
-                (self.left is None and self.right is not None))
+        return (self.left is None) != (self.right is None)
 
     def has_two_children(self) -> bool:
         """Returns true if self has exactly two children, false otherwise."""
         return self.left is not None and self.right is not None
 
     def count(self) -> int:
-        """Counts the numbers of nodes under self (including self)."""
-        if not self.has_children():
-            return 1
-        else:
-            c = 0
-            return self._count(self, c)
-
-    def _count(self, u: "_BSTNode", c: int) -> int:
-        if u is None:
-            return c
-        else:
+        """Counts the numbers of nodes under self (including self).
+
+        Contrary to size, which is only maintained by a BST, the nodes are
+        actually counted, so this also works for nodes linked manually."""
+        c = 0
+        stack = [self]
+        while stack:
+            u = stack.pop()
             c += 1
-        c = self._count(u.left, c)
-        c = self._count(u.right, c)
+            if u.left is not None:
+                stack.append(u.left)
+            if u.right is not None:
+                stack.append(u.right)
         return c
 
     def __str__(self):
@@ -175,7 +197,7 @@ class BST:
         Time complexity: O(1)."""
         assert is_bst(self)
         if self._root is not None:
-            assert self._root.count() == self._n
+            assert self._root.size == self._n
         else:
             assert self._n == 0
         return self._n
@@ -206,6 +228,27 @@ class BST:
                 assert u.parent is None
         return u == self._root
 
+    @staticmethod
+    def _update_size(u: _BSTNode) -> None:
+        """Recomputes the size of u from the sizes of its children.
+
+        Time complexity: O(1)."""
+        u.size = 1
+        if u.left is not None:
+            u.size += u.left.size
+        if u.right is not None:
+            u.size += u.right.size
+
+    @staticmethod
+    def _decrement_sizes(u: _BSTNode) -> None:
+        """Decrements the sizes of u and of all its ancestors, after a node has
+        been removed from the subtree rooted at u.
+
+        Time complexity: O(h)."""
+        while u is not None:
+            u.size -= 1
+            u = u.parent
+
     def insert(self, key: object) -> None:
         """Inserts key into this BST.
 
@@ -226,12 +269,14 @@ class BST:
 
             while c is not None:
                 p = c
-                if key_node.key < c.key:
+                # key_node is going to be in the subtree rooted at c.
+                c.size += 1
+                if key < c.key:
                     c = c.left
                 else:
                     c = c.right
 
-            if key_node.key < p.key:
+            if key < p.key:
                 p.left = key_node
             else:
                 p.right = key_node
@@ -242,6 +287,54 @@ class BST:
 
         assert is_bst(self)
 
+    def insert_many(self, keys: list) -> None:
+        """Inserts all keys into this BST.
+
+        Inserting the keys one at a time can produce a tree whose height is
+        proportional to the number of keys (for example, if the keys are
+        sorted), which makes every subsequent operation linear. Instead, the
+        keys already in this BST and the given keys are merged in sorted order,
+        and the tree is rebuilt, so that it becomes perfectly balanced, i.e.
+        its height is ⌈log₂(n + 1)⌉.
+
+        Time complexity: O(n + m * log₂(m)), where m is the number of keys to
+        insert."""
+        assert is_bst(self)
+
+        keys = list(keys)
+        for key in keys:
+            if key is None:
+                raise ValueError("key cannot be None")
+
+        # The keys already in this BST are visited in increasing order.
+        ordered = heapq.merge(
+            (u.key for u in BST._in_order_traversal(self._root)),
+            sorted(keys))
+        ordered = list(ordered)
+
+        self._root = BST._build_balanced(ordered, 0, len(ordered), None)
+        self._n = len(ordered)
+
+        assert is_bst(self)
+
+    @staticmethod
+    def _build_balanced(keys: list, lo: int, hi: int,
+                        parent: _BSTNode) -> _BSTNode:
+        """Builds a perfectly balanced BST with the sorted keys[lo:hi], whose
+        root has parent as its parent, and returns its root.
+
+        The depth of the recursion is only O(log₂(hi - lo)).
+
+        Time complexity: O(hi - lo)."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        u = _BSTNode(keys[mid], parent)
+        u.left = BST._build_balanced(keys, lo, mid, u)
+        u.right = BST._build_balanced(keys, mid + 1, hi, u)
+        u.size = hi - lo
+        return u
+
     def contains(self, key: object) -> bool:
         """Returns true if key is in this BST, false otherwise.
 
@@ -250,7 +343,6 @@ class BST:
         if key is None:
             raise ValueError("key cannot be None")
         key_node = self._search_key_iteratively(key, self._root)
-        assert self._search_key_recursively(key, self._root) == key_node
         assert is_bst(self)
         return key_node is not None
 
@@ -262,43 +354,54 @@ class BST:
         Time complexity: O(m)."""
         c = u  # Current node.
         while c is not None:
-            if key == c.key:
+            k = c.key
+            if key == k:
                 return c
-            elif key < c.key:
+            elif key < k:
                 c = c.left
             else:
                 c = c.right
 
-    def _search_key_recursively(self, key: object, u: _BSTNode) -> _BSTNode:
-        """Returns the _BSTNode object c such that c.key == key, or None if no
-        such object exists.
-
-        Time complexity: O(m)."""
-        if u is None or key == u.key:
-            return u
-        elif key < u.key:
-            return self._search_key_recursively(key, u.left)
-        else:
-            return self._search_key_recursively(key, u.right)
-
     def rank(self, key: object) -> int:
         """Returns the number of keys strictly less than key.
 
         Time complexity: O(h)."""
         assert is_bst(self)
-        if not self.contains(key):
+        if key is None:
+            raise ValueError("key cannot be None")
+        r = self._rank(self._root, key)
+        if r is None:
             raise LookupError("key was not found")
-        return self._rank(self._root, key, 0)
-
-    def _rank(self, u: _BSTNode, key, r: int) -> int:
-        if u is None:
-            return r
-        if u.key < key:
-            r += 1
-        r = self._rank(u.left, key, r)
-        r = self._rank(u.right, key, r)
         return r
 
+    @staticmethod
+    def _rank(u: _BSTNode, key) -> int:
+        """Returns the number of keys strictly less than key in the subtree
+        rooted at u, or None if key is not in that subtree.
+
+        If u.key < key, then u and all keys in its left subtree are less than
+        key, and we only need to look for other such keys in its right subtree.
+        Otherwise, no key in the right subtree of u is less than key. Hence,
+        using the sizes of the subtrees, only one path from u down to a leaf
+        needs to be followed, which also passes through key, if it exists, so
+        no separate search is needed to check that key exists.
+
+        Time complexity: O(m)."""
+        r = 0
+        found = False
+        while u is not None:
+            k = u.key
+            if k < key:
+                r += 1 + (u.left.size if u.left is not None else 0)
+                u = u.right
+            else:
+                # Keys equal to key may also be in the left subtree of u, so we
+                # keep descending in order not to count them.
+                if k == key:
+                    found = True
+                u = u.left
+        return r if found else None
+
     def height(self) -> int:
         """Returns the maximum height of this BST.
 
@@ -312,10 +415,24 @@ class BST:
         else:
             return self._height(self._root)
 
-    def _height(self, u: _BSTNode) -> int:
-        if u is None:
-            return 0
-        return 1 + max(self._height(u.left), self._height(u.right))
+    @staticmethod
+    def _height(u: _BSTNode) -> int:
+        """Returns the height of the subtree rooted at u.
+
+        The nodes are visited iteratively, using an explicit stack of pairs
+        (node, depth of node), so that deep (unbalanced) trees do not exceed
+        the recursion limit."""
+        h = 0
+        stack = [(u, 1)] if u is not None else []
+        while stack:
+            u, d = stack.pop()
+            if d > h:
+                h = d
+            if u.left is not None:
+                stack.append((u.left, d + 1))
+            if u.right is not None:
+                stack.append((u.right, d + 1))
+        return h
 
     def minimum(self) -> object:
         """Returns the minimum key in this BST, or None if this BST is empty.
@@ -324,7 +441,6 @@ class BST:
         assert is_bst(self)
         if self._root is not None:
             m = BST._minimum(self._root)
-            assert m == BST._minimum_recursively(self._root)
             assert is_bst(self)
             return m.key if m is not None else None
 
@@ -336,14 +452,6 @@ class BST:
             u = u.left
         return u
 
-    @staticmethod
-    def _minimum_recursively(u: _BSTNode) -> _BSTNode:
-        """Recursive version of the BST._minimum function."""
-        assert u is not None
-        if u.has_left_child():
-            u = BST._minimum_recursively(u.left)
-        return u
-
     def maximum(self) -> object:
         """Returns the maximum key in this BST, or None if this BST is empty.
 
@@ -351,7 +459,6 @@ class BST:
         assert is_bst(self)
         if self._root is not None:
             m = BST._maximum(self._root)
-            assert m == BST._maximum_recursively(self._root)
             assert is_bst(self)
             return m.key if m is not None else None
 
@@ -363,14 +470,6 @@ class BST:
             u = u.right
         return u
 
-    @staticmethod
-    def _maximum_recursively(u: _BSTNode) -> _BSTNode:
-        """Recursive version of the BST._maximum function."""
-        assert u is not None
-        if u.has_right_child():
-            u = BST._maximum_recursively(u.right)
-        return u
-
     def successor(self, key: object) -> object:
         """Finds the successor of key, i.e. the smallest element greater than
         key, or None if key does not have a successor.
@@ -405,7 +504,7 @@ class BST:
             return BST._minimum(u.right)
 
         p = u.parent
-        while p is not None and p.right == u:
+        while p is not None and p.right is u:
             u = p
             p = u.parent
 
@@ -440,7 +539,7 @@ class BST:
             return BST._maximum(u.left)
 
         p = u.parent
-        while p is not None and u == p.left:
+        while p is not None and p.left is u:
             u = p
             p = u.parent
 
@@ -474,6 +573,9 @@ class BST:
             else:
                 m.parent.right = None
 
+        # m has been detached from its parent (if it had one).
+        BST._decrement_sizes(m.parent)
+
         self._n -= 1
         assert is_bst(self)
 
@@ -502,6 +604,8 @@ class BST:
             else:  # m is an internal node with no right subtree.
                 m.parent.left = None
 
+        BST._decrement_sizes(m.parent)
+
         self._n -= 1
         assert is_bst(self)
 
@@ -525,76 +629,87 @@ class BST:
             raise LookupError("key not in this BST")
 
         self._n -= 1
-        self._delete_aux(key_node)
+        self._delete_node(key_node)
         assert is_bst(self)
 
-    def _delete_aux(self, u: _BSTNode) -> _BSTNode:
-        """When deleting a node u from a BST, we have basically to consider 3
+    def _delete_node(self, u: _BSTNode) -> _BSTNode:
+        """Removes the node u from this BST and returns it, after clearing its
+        links.
+
+        The subtree sizes of the ancestors of u are updated, but the number of
+        keys of this BST, self._n, is not decremented, which is left to the
+        callers.
+
+        When deleting a node u from a BST, we have basically to consider 3
         cases:
 
-        1. u has no children, then we simply remove it by modifying its parent
-        to replace u with None. If u.parent is None, then u must be the root,
-        and thus we simply set the root to None.
+        1. u has no children, then we simply replace u with None (its missing
+        child) in its parent. If u.parent is None, then u must be the root, and
+        thus the root becomes None.
 
-        2. u has just one child, but we first need to decide which one (left or
-        right). Then we elevate this child to u's position in the tree by
-        modifying u's parent to replace u by u's child. But if u's parent is
-        None, that means u was the root, and the new root becomes u's child.
+        2. u has just one child, then we elevate this child to u's position in
+        the tree by replacing u with it in u's parent. If u.parent is None,
+        then u was the root, and the new root becomes u's child.
 
-        3. u has two children, then we search for u's successor s, (which must
-        be in the u's right subtree, and it's the smallest of that subtree)
-        which takes u's position in the tree. The rest of the u's subtree
-        becomes the s's right subtree, and the u's left subtree becomes the new
-        s's left subtree. This case is a little bit tricky, because it matters
-        whether s is u's right child.
+        3. u has two children, then its successor s is the minimum of u's right
+        subtree, so it has no left child, and s takes u's position in the tree.
+        If s is not u's right child, then s is first replaced by its own right
+        child, and u's right subtree becomes the s's right subtree. In both
+        cases, u's left subtree becomes the s's left subtree.
 
-        Suppose s is the right child of u, then we replace u by s, which might
-        or not have a right subtree, but no left subtree.
+        The successor of u is found while descending u's right subtree, and the
+        nodes are moved with _transplant, without any further search.
 
-        Suppose s is not the right child of u, in this case, we replace s by its
-        own right child, and then we replace u by s.
+        Time complexity: O(h)."""
+        if u.left is None:  # Cases 1 and 2, when u has at most a right child.
+            lowest = u.parent
+            self._transplant(u, u.right)
+        elif u.right is None:  # Case 2, when u has only a left child.
+            lowest = u.parent
+            self._transplant(u, u.left)
+        else:  # Case 3.
+            s = u.right
+            while s.left is not None:
+                s = s.left
+
+            if s.parent is not u:
+                lowest = s.parent
+                self._transplant(s, s.right)
+                s.right = u.right
+                s.right.parent = s
+            else:
+                lowest = s
 
-        Note that self._delete_when_two_children does not exactly do that, but
-        instead it simply replaces the positions of u and s, as if s was u and u
-        was s.
+            self._transplant(u, s)
+            s.left = u.left
+            s.left.parent = s
 
-        After that, _delete is called again on u, but note that u is now in the
-        previous s's position, and thus u has now no left subtree, but at most a
-        right subtree."""
-        if u.has_two_children():
-            self._delete_when_two_children(u)
-        else:  # u has at most one child.
-            self._delete_when_at_most_one_child(u)
+        # The sizes of the subtrees that lost u (or s, which moved up) are
+        # recomputed from the lowest modified node up to the root.
+        while lowest is not None:
+            BST._update_size(lowest)
+            lowest = lowest.parent
 
         u.right = u.left = u.parent = None
+        u.size = 1
         return u
 
-    def _delete_when_two_children(self, u: _BSTNode) -> None:
-        """Called by _delete_aux when a node has two children."""
-        assert u is not None
-        # Replace u with its successor s.
-        self._switch(u, self._successor(u))
-        # u has at most a right child now.
-        self._delete_aux(u)
+    def _transplant(self, u: _BSTNode, v: _BSTNode) -> None:
+        """Replaces the subtree rooted at u with the subtree rooted at v (which
+        may be None) as a child of u's parent.
 
-    def _delete_when_at_most_one_child(self, u: _BSTNode) -> None:
-        """Removes u from the tree, when u has at most one child.
+        Note that u's children are not modified.
 
-        This means that u could have 0 or 1 child."""
-        assert u is not None
-        child = u.right
-        if u.left:
-            child = u.left
-        if not u.has_parent():  # u is the root.
-            self._root = child
-        else:  # u has a parent, so it is not the root.
-            if u.is_left_child():
-                u.parent.left = child
-            else:
-                u.parent.right = child
-        # child is None iff u.right and u.left are None.
-        if child:
-            child.parent = u.parent
+        Time complexity: O(1)."""
+        p = u.parent
+        if p is None:  # u is the root.
+            self._root = v
+        elif p.left is u:
+            p.left = v
+        else:
+            p.right = v
+        if v is not None:
+            v.parent = p
 
     def _switch(self, x: _BSTNode, y: _BSTNode) -> None:
         """"Switches the roles of x and y in the tree by moving references."""
@@ -608,6 +723,9 @@ class BST:
         else:
             self._switch_nodes_when_not_parent_child(x, y)
 
+        # The sizes belong to the positions in the tree, not to the nodes.
+        x.size, y.size = y.size, x.size
+
     def _switch_nodes_when_not_parent_child(self, x: _BSTNode,
                                             y: _BSTNode) -> None:
         """x and y are nodes in the tree that are not related by a parent-child.
@@ -615,31 +733,26 @@ class BST:
         Time complexity: O(1)."""
         assert x.parent != y and y.parent != x
 
-        if not x.has_parent():
+        xp, x_is_left = x.parent_and_side()
+        yp, y_is_left = y.parent_and_side()
+
+        # y takes the position of x under x's parent (or as root), and vice
+        # versa. At most one of x and y can be the root.
+        if xp is None:
             self._root = y
-            if y.is_left_child():
-                y.parent.left = x
-            else:
-                y.parent.right = x
-        elif not y.has_parent():
+        elif x_is_left:
+            xp.left = y
+        else:
+            xp.right = y
+
+        if yp is None:
             self._root = x
-            if x.is_left_child():
-                x.parent.left = y
-            else:
-                x.parent.right = y
-        else:  # Neither x nor y are the root.
-            if x.is_left_child():
-                if y.is_left_child():
-                    y.parent.left, x.parent.left = x, y
-                else:
-                    y.parent.right, x.parent.left = x, y
-            else:
-                if y.is_left_child():
-                    y.parent.left, x.parent.right = x, y
-                else:
-                    y.parent.right, x.parent.right = x, y
+        elif y_is_left:
+            yp.left = x
+        else:
+            yp.right = x
 
-        y.parent, x.parent = x.parent, y.parent
+        x.parent, y.parent = yp, xp
         x.left, y.left = y.left, x.left
         x.right, y.right = y.right, x.right
 
@@ -657,7 +770,9 @@ class BST:
         of c (child)."""
         assert c.parent == p
 
-        if c.is_left_child():
+        gp, p_is_left = p.parent_and_side()
+
+        if p.left is c:
             p.left = c.left
             if c.left:
                 c.left.parent = p
@@ -682,30 +797,36 @@ class BST:
             if p.left:
                 p.left.parent = p
 
-        if p.parent:
-            if p.is_left_child():
-                p.parent.left = c
-            else:
-                p.parent.right = c
-        else:  # p is the root.
+        if gp is None:  # p is the root.
             self._root = c
+        elif p_is_left:
+            gp.left = c
+        else:
+            gp.right = c
 
-        c.parent = p.parent
+        c.parent = gp
         p.parent = c
 
     def in_order_traversal(self) -> None:
         """Prints the elements of the tree in increasing order.
 
-        Time complexity: O(h)."""
+        Time complexity: O(n)."""
         assert is_bst(self)
-        self._in_order_traversal(self._root)
-        print("\n")
+        BST._print_keys(BST._in_order_traversal(self._root))
 
-    def _in_order_traversal(self, u: _BSTNode, e=", ") -> None:
-        if u is not None:
-            self._in_order_traversal(u.left)
-            print(u, end=e)
-            self._in_order_traversal(u.right)
+    @staticmethod
+    def _in_order_traversal(u: _BSTNode) -> list:
+        """Returns the nodes of the subtree rooted at u in in-order."""
+        nodes = []
+        stack = []
+        while u is not None or stack:
+            while u is not None:
+                stack.append(u)
+                u = u.left
+            u = stack.pop()
+            nodes.append(u)
+            u = u.right
+        return nodes
 
     def pre_order_traversal(self) -> None:
         """Prints the keys of this tree in pre-order.
@@ -713,46 +834,79 @@ class BST:
         The pre-order consists of recursively printing first a node u, then its
         left child node and then its right child node.
 
-        Time complexity: O(h)."""
+        Time complexity: O(n)."""
         assert is_bst(self)
-        self._pre_order_traversal(self._root)
-        print("\n")
+        BST._print_keys(BST._pre_order_traversal(self._root))
 
-    def _pre_order_traversal(self, u: _BSTNode, e=", ") -> None:
-        if u is not None:
-            print(u, end=e)
-            self._pre_order_traversal(u.left)
-            self._pre_order_traversal(u.right)
+    @staticmethod
+    def _pre_order_traversal(u: _BSTNode) -> list:
+        """Returns the nodes of the subtree rooted at u in pre-order."""
+        nodes = []
+        stack = [u] if u is not None else []
+        while stack:
+            u = stack.pop()
+            nodes.append(u)
+            # The right child is pushed first, so that it is popped last.
+            if u.right is not None:
+                stack.append(u.right)
+            if u.left is not None:
+                stack.append(u.left)
+        return nodes
 
     def post_order_traversal(self) -> None:
         """Prints the keys of this tree in post-order. It does the opposite of
         pre_order_traversal.
 
-        Time complexity: O(h)."""
+        Time complexity: O(n)."""
         assert is_bst(self)
-        self._post_order_traversal(self._root)
-        print("\n")
+        BST._print_keys(BST._post_order_traversal(self._root))
 
-    def _post_order_traversal(self, u: _BSTNode, e=", ") -> None:
-        if u is not None:
-            self._post_order_traversal(u.left)
-            self._post_order_traversal(u.right)
-            print(u, end=e)
+    @staticmethod
+    def _post_order_traversal(u: _BSTNode) -> list:
+        """Returns the nodes of the subtree rooted at u in post-order.
+
+        The post-order (left, right, node) is the reverse of the pre-order
+        where the right child is visited before the left one (node, right,
+        left)."""
+        nodes = []
+        stack = [u] if u is not None else []
+        while stack:
+            u = stack.pop()
+            nodes.append(u)
+            if u.left is not None:
+                stack.append(u.left)
+            if u.right is not None:
+                stack.append(u.right)
+        nodes.reverse()
+        return nodes
 
     def reverse_in_order_traversal(self) -> None:
         """Prints the keys of this tree in decreasing order. It does the
         opposite of self.in_order_traversal.
 
-        Time complexity: O(h)."""
+        Time complexity: O(n)."""
         assert is_bst(self)
-        self._reverse_in_order_traversal(self._root)
-        print("\n")
+        BST._print_keys(BST._reverse_in_order_traversal(self._root))
 
-    def _reverse_in_order_traversal(self, u: _BSTNode, e=", ") -> None:
-        if u is not None:
-            self._reverse_in_order_traversal(u.right)
-            print(u, end=e)
-            self._reverse_in_order_traversal(u.left)
+    @staticmethod
+    def _reverse_in_order_traversal(u: _BSTNode) -> list:
+        """Returns the nodes of the subtree rooted at u in reverse in-order."""
+        nodes = []
+        stack = []
+        while u is not None or stack:
+            while u is not None:
+                stack.append(u)
+                u = u.right
+            u = stack.pop()
+            nodes.append(u)
+            u = u.left
+        return nodes
+
+    @staticmethod
+    def _print_keys(nodes: list, e=", ") -> None:
+        """Prints the keys of nodes, each of them followed by e, with a single
+        call to print."""
+        print("".join(str(u) + e for u in nodes) + "\n")
 
     def __str__(self):
         if self._root is None:
@@ -763,58 +917,68 @@ class BST:
         return self.__str__()
 
 
-def build_pretty_bst(node: _BSTNode, only_list: bool = True):
-    """Pretty-prints this BST object."""
-    if not isinstance(_BSTNode):
-        raise TypeError("node must be an instance of _BSTNode")
-    if not isinstance(only_list, bool):
-        raise TypeError("only_list must be a bool")
-
-    if node is None:
-        if only_list:
-            return []
-        else:
-            return [], 0, 0
-
-    fill = "_"
-
-    left_lines, left_pos, left_width = build_pretty_bst(node.left)
-    right_lines, right_pos, right_width = build_pretty_bst(node.right)
-    middle = max(right_pos + left_width - left_pos + 1, len(node.key), 2)
-    pos = left_pos + middle // 2
-    width = left_pos + middle + right_width - right_pos
-
-    while len(left_lines) < len(right_lines):
-        left_lines.append(' ' * left_width)
-
-    while len(right_lines) < len(left_lines):
-        right_lines.append(' ' * right_width)
-
-    if ((middle - len(node.key)) % 2 == 1 and node.parent is not None and
-            node is node.parent.left and len(node.key) < middle):
-        node.key += fill
-
-    node.key = node.key.center(middle, fill)
-
-    if node.key[0] == fill:
-        node.key = ' ' + node.key[1:]
-
-    if node.key[-1] == fill:
-        node.key = node.key[:-1] + ' '
-
-    lines = [' ' * left_pos + node.key + ' ' * (right_width - right_pos),
-             ' ' * left_pos + '/' + ' ' * (middle - 2) +
-             '\\' + ' ' * (right_width - right_pos)] + \
-            [left_line + ' ' * (width - left_width - right_width) +
-
-             right_line
-
-             for left_line, right_line in zip(left_lines, right_lines)]
-
-    if only_list:
-        return lines
-    else:
-        return lines, pos, width
+def build_pretty_bst(root: _BSTNode) -> list:
+    """Returns the lines of a drawing of the tree rooted at root.
+
+    Each node is assigned the columns of its label according to its position in
+    the in-order traversal of the tree, so that all nodes of its left subtree
+    are drawn to its left, and all nodes of its right subtree to its right. The
+    nodes at depth d are then drawn on the line 2 * d, and the edges to their
+    children on the line 2 * d + 1.
+
+    The nodes are neither modified nor visited recursively, and each line is
+    only joined once.
+
+    Time complexity: O(n + h * w), where w is the width of the drawing."""
+    if root is not None and not isinstance(root, _BSTNode):
+        raise TypeError("root must be an instance of _BSTNode")
+
+    if root is None:
+        return []
+
+    # Maps each node to its label and the first column of its label.
+    labels = {}
+    columns = {}
+    # Nodes in in-order, together with their depths.
+    nodes = []
+
+    column = 0
+    stack = []
+    u, d = root, 0
+    while u is not None or stack:
+        while u is not None:
+            stack.append((u, d))
+            u, d = u.left, d + 1
+        u, d = stack.pop()
+        nodes.append((u, d))
+        labels[u] = str(u.key)
+        columns[u] = column
+        # Labels of consecutive nodes are separated by one space.
+        column += len(labels[u]) + 1
+        u, d = u.right, d + 1
+
+    width = column - 1
+    height = max(d for _, d in nodes) + 1
+    lines = [[" "] * width for _ in range(2 * height - 1)]
+
+    for u, d in nodes:
+        label = labels[u]
+        start = columns[u]
+        end = start + len(label)
+        line = lines[2 * d]
+        line[start:end] = label
+
+        if u.left is not None:
+            c = columns[u.left] + len(labels[u.left]) // 2
+            line[c + 1:start] = "_" * (start - c - 1)
+            lines[2 * d + 1][c] = "/"
+
+        if u.right is not None:
+            c = columns[u.right] + len(labels[u.right]) // 2
+            line[end:c] = "_" * (c - end)
+            lines[2 * d + 1][c] = "\\"
+
+    return ["".join(line).rstrip() for line in lines]
 
 
 def has_bst_property(n: _BSTNode) -> bool:
@@ -822,22 +986,37 @@ def has_bst_property(n: _BSTNode) -> bool:
     each node u, all nodes in its left sub-tree are smaller than u, and all
     nodes in its right sub-tree are greater than u.
 
-    It also checks that parent pointers are correctly set up."""
-    if n is not None:
-        if n.left and n.key < n.left.key:
+    It also checks that parent pointers are correctly set up, and that the
+    size of each node u is 1 plus the sizes of its children, i.e. the number of
+    nodes in the subtree rooted at u.
+
+    The nodes are visited iteratively, so that deep (unbalanced) trees do not
+    exceed the recursion limit."""
+    stack = [n] if n is not None else []
+    while stack:
+        n = stack.pop()
+        left = n.left
+        right = n.right
+
+        if left and n.key < left.key:
             return False
-        if n.right and n.key > n.right.key:
+        if right and n.key > right.key:
             return False
 
         # Asserting n.left and n.right have n as parent.
-        if n.left:
-            if n.left.parent != n:
+        if left:
+            if left.parent != n:
                 return False
-        if n.right:
-            if n.right.parent != n:
+            stack.append(left)
+        if right:
+            if right.parent != n:
                 return False
+            stack.append(right)
 
-        return has_bst_property(n.left) and has_bst_property(n.right)
+        # Asserting the size of n is consistent with the sizes of its children.
+        if n.size != (1 + (left.size if left else 0) +
+                      (right.size if right else 0)):
+            return False
 
     return True
 
@@ -845,12 +1024,17 @@ def has_bst_property(n: _BSTNode) -> bool:
 def all_bst_nodes(n: _BSTNode) -> bool:
     """Returns true if all nodes under n (including n) are instances of _BSTNode,
     false otherwise."""
-    if n is not None:
+    stack = [n] if n is not None else []
+    while stack:
+        n = stack.pop()
         # If either n or its parent are not instances of _BSTNode.
         if (not isinstance(n, _BSTNode) or
                 (n.parent is not None and not isinstance(n.parent, _BSTNode))):
             return False
-        return all_bst_nodes(n.left) and all_bst_nodes(n.right)
+        if n.left is not None:
+            stack.append(n.left)
+        if n.right is not None:
+            stack.append(n.right)
     return True
 
 
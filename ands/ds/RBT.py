@@ -8,7 +8,7 @@ Author: Nelson Brochado
 
 Created: 01/08/2015
 
-Updated: 28/09/2017
+Updated: 15/10/2026
 
 # Description
 
@@ -126,7 +126,12 @@ BLACK = "BLACK"
 
 
 class _RBTNode(_BSTNode):
-    """Class to represent a node of a RBT."""
+    """Class to represent a node of a RBT.
+
+    Only the additional color attribute is declared in __slots__, since the
+    others are inherited from _BSTNode, so that nodes have no __dict__."""
+
+    __slots__ = ("color",)
 
     def __init__(self, key, color=BLACK, parent=None, left=None, right=None):
         _BSTNode.__init__(self, key, parent, left, right)
@@ -191,9 +196,11 @@ class RBT(BST):
 
         while c is not None:
             p = c
-            if key_node.key < c.key:
+            # key_node is going to be in the subtree rooted at c.
+            c.size += 1
+            if key < c.key:
                 c = c.left
-            else:  # key.key >= c.key
+            else:  # key >= c.key
                 c = c.right
 
         key_node.parent = p
@@ -202,7 +209,7 @@ class RBT(BST):
         # Case 1: node is inserted as root.
         if p is None:
             self._root = key_node
-        elif p.key > key_node.key:
+        elif p.key > key:
             p.left = key_node
         else:  # p.key < key.key
             p.right = key_node
@@ -213,63 +220,82 @@ class RBT(BST):
 
         assert is_rbt(self)
 
+    def insert_many(self, keys: list) -> None:
+        """Inserts all keys into this RBT, one at a time.
+
+        Contrary to BST.insert_many, the tree is not rebuilt, because it is
+        already balanced and its nodes must keep a valid coloring.
+
+        Time complexity: O(m * log₂(n + m)), where m is the number of keys to
+        insert."""
+        keys = list(keys)
+        for key in keys:
+            if key is None:
+                raise ValueError("key cannot be None")
+        for key in keys:
+            self.insert(key)
+
     def _fix_insertion(self, u: _RBTNode) -> None:
+        # The parent, grandparent and uncle of u are bound to locals once,
+        # rather than accessed repeatedly through the properties of u.
+        p = u.parent
+
         # u is the root and we color it BLACK.
-        if u.parent is None:
+        if p is None:
             u.color = BLACK
 
-        elif u.parent.color == BLACK:
+        elif p.color == BLACK:
             return
 
-        elif (u.parent.color == RED and
-              (u.uncle is not None and u.uncle.color == RED)):
-            u.parent.color = BLACK
-            u.uncle.color = BLACK
-            u.grandparent.color = RED
-            self._fix_insertion(u.grandparent)
+        else:  # p is RED, so it is not the root, and u has a grandparent.
+            gp = p.parent
+            uncle = u.uncle
 
-        elif (u.parent.color == RED and
-              (u.uncle is None or u.uncle.color == BLACK)):
+            if uncle is not None and uncle.color == RED:
+                p.color = BLACK
+                uncle.color = BLACK
+                gp.color = RED
+                self._fix_insertion(gp)
 
             # u is added as a right child to a node that is the left child.
-            if u.parent.is_left_child() and u.is_right_child():
+            elif p is gp.left and u is p.right:
 
                 # left_rotation does not violate the property: all paths from
                 # any given node to its leaf nodes contain the same number of
                 # black nodes.
-                self._left_rotate(u.parent)
+                self._left_rotate(p)
 
-                # With the previous _left_rotate call, u.parent has become the
-                # left child of u, or, u bas become the parent of what before
-                # was u.parent.
+                # With the previous _left_rotate call, p has become the left
+                # child of u, or, u bas become the parent of what before was p.
                 #
                 # We can pass to case 5, where we have 2 red nodes in a row,
-                # specifically, u.parent and u, which are both left children of
-                # their parents.
+                # specifically, p and u, which are both left children of their
+                # parents.
 
-                self._fix_insertion(u.left)
+                self._fix_insertion(p)
 
             # u is added as a left child to a node that is the right child.
-            elif u.parent.is_right_child() and u.is_left_child():
-                self._right_rotate(u.parent)
-                self._fix_insertion(u.right)
+            elif p is gp.right and u is p.left:
+                self._right_rotate(p)
+                self._fix_insertion(p)
 
             # u is added as a left child to a node that is the left child.
-            elif u.parent.is_left_child() and u.is_left_child():
+            elif p is gp.left:
+                assert u is p.left
                 # Note: grandparent is known to be black, since its former child
                 # could not have been RED without violating property 4.
-                self._right_rotate(u.grandparent)
-                u.parent.color = BLACK
-                u.parent.right.color = RED
+                self._right_rotate(gp)
+                # gp is now the right child of p.
+                p.color = BLACK
+                gp.color = RED
 
             # u is added as a right child to a node that is the right child.
-            elif u.parent.is_right_child() and u.is_right_child():
-                self._left_rotate(u.grandparent)
-                u.parent.color = BLACK
-                u.parent.left.color = RED
-
             else:
-                assert False
+                assert p is gp.right and u is p.right
+                self._left_rotate(gp)
+                # gp is now the left child of p.
+                p.color = BLACK
+                gp.color = RED
 
     def _left_rotate(self, u: _RBTNode) -> _RBTNode:
         """Left rotates the subtree rooted at node u.
@@ -280,32 +306,41 @@ class RBT(BST):
         Time complexity: O(1)."""
         assert u.has_right_child()
 
-        u.right.parent = u.parent
+        # The right child of u, which becomes the new parent of u.
+        r = u.right
+        p = u.parent
+
+        r.parent = p
 
         # Only the root has a None parent.
-        if not u.has_parent():
-            self._root = u.right
+        if p is None:
+            self._root = r
 
         # Checking if u is a left or a right child, in order to set the new left
         # or right child respectively of its parent.
-        elif u.is_left_child():
-            u.parent.left = u.right
+        elif p.left is u:
+            p.left = r
         else:
-            u.parent.right = u.right
+            p.right = r
 
-        u.parent = u.right
+        u.parent = r
 
         # The new right child of u becomes what is the left child of its
         # previous right child.
-        u.right = u.parent.left
+        u.right = r.left
 
         # Set u to be the parent of its new right child.
-        if u.has_right_child():
+        if u.right is not None:
             u.right.parent = u
 
         # Set u to be the new left child of its new parent.
-        u.parent.left = u
-        return u.parent
+        r.left = u
+
+        # The new parent of u takes the place of u, so it has the same size.
+        r.size = u.size
+        self._update_size(u)
+
+        return r
 
     def _right_rotate(self, u: _RBTNode) -> _RBTNode:
         """Right rotates the subtree rooted at node u.
@@ -313,23 +348,31 @@ class RBT(BST):
         Time complexity: O(1)."""
         assert u.has_left_child()
 
-        u.left.parent = u.parent
+        # The left child of u, which becomes the new parent of u.
+        l = u.left
+        p = u.parent
+
+        l.parent = p
 
-        if not u.has_parent():
-            self._root = u.left
-        elif u.is_left_child():
-            u.parent.left = u.left
+        if p is None:
+            self._root = l
+        elif p.left is u:
+            p.left = l
         else:
-            u.parent.right = u.left
+            p.right = l
 
-        u.parent = u.left
-        u.left = u.parent.right
+        u.parent = l
+        u.left = l.right
 
-        if u.has_left_child():
+        if u.left is not None:
             u.left.parent = u
 
-        u.parent.right = u
-        return u.parent
+        l.right = u
+
+        l.size = u.size
+        self._update_size(u)
+
+        return l
 
     def delete(self, key: object) -> None:
         """Delete key from this RBT object.
@@ -345,6 +388,22 @@ class RBT(BST):
         if key_node is None:
             raise LookupError("key not in this BST")
 
+        self._n -= 1
+        self._delete_node(key_node)
+
+        assert is_rbt(self)
+
+    def _delete_node(self, key_node: _RBTNode) -> _RBTNode:
+        """Removes key_node from this RBT, restores the red-black properties,
+        and returns key_node, which is detached from the tree.
+
+        As for BST._delete_node, the subtree sizes of the ancestors of key_node
+        are updated, but the number of keys of this RBT, self._n, is not
+        decremented, which is left to the callers. This method takes the node
+        itself, so that callers which already have it (e.g. remove_max and
+        remove_min) do not need to search for it again by key.
+
+        Time complexity: O(log₂(n))."""
         # If key has 2 non-leaf children, then replace key with its successor.
         # Note: we exchange also the colors of key and its successor.
         if key_node.has_left_child() and key_node.has_right_child():
@@ -373,10 +432,11 @@ class RBT(BST):
                     not key_node.has_right_child())
             assert key_node != self._root
 
-            if key_node.is_left_child():
-                key_node.parent.left = None
+            p, is_left = key_node.parent_and_side()
+            if is_left:
+                p.left = None
             else:
-                key_node.parent.right = None
+                p.right = None
 
         else:  # key.color == BLACK
 
@@ -389,30 +449,15 @@ class RBT(BST):
             # BLACK, both of these properties are preserved.
 
             if key_node.has_left_child() and key_node.left.color == RED:
-                if self._root != key_node:
-                    if key_node.is_left_child():
-                        key_node.parent.left = key_node.left
-                    else:
-                        key_node.parent.right = key_node.left
-
-                key_node.left.parent = key_node.parent
-                key_node.left.color = BLACK
-
-                if self._root == key_node:
-                    self._root = key_node.left
+                c = key_node.left
+                # c takes the position of key_node (possibly as the root).
+                self._transplant(key_node, c)
+                c.color = BLACK
 
             elif key_node.has_right_child() and key_node.right.color == RED:
-                if self._root != key_node:
-                    if key_node.is_left_child():
-                        key_node.parent.left = key_node.right
-                    else:
-                        key_node.parent.right = key_node.right
-
-                key_node.right.parent = key_node.parent
-                key_node.right.color = BLACK
-
-                if self._root == key_node:
-                    self._root = key_node.right
+                c = key_node.right
+                self._transplant(key_node, c)
+                c.color = BLACK
             else:
                 # This the complex case: both key and c (the child) are BLACK.
 
@@ -441,17 +486,21 @@ class RBT(BST):
 
                     # We begin by replacing key with its child c.
                     # Note: both children of key are leaf children.
-                    if key_node.is_left_child():
-                        key_node.parent.left = None
+                    p, is_left = key_node.parent_and_side()
+                    if is_left:
+                        p.left = None
                     else:
-                        key_node.parent.right = None
+                        p.right = None
 
                 else:
                     self._root = None
 
-        self._n -= 1
+        # key_node has been detached from its parent (if it had one).
+        self._decrement_sizes(key_node.parent)
 
-        assert is_rbt(self)
+        key_node.right = key_node.left = key_node.parent = None
+        key_node.size = 1
+        return key_node
 
     def _delete_case_1(self, u: _RBTNode) -> None:
         # This check is necessary because this function is also called from the
@@ -459,84 +508,105 @@ class RBT(BST):
         if u.parent is not None:
             self._delete_case_2(u)
 
+    # In the following cases, the parent and the sibling of u are bound to
+    # locals once, and re-fetched by the next case after each rotation.
+
     def _delete_case_2(self, u: _RBTNode) -> None:
-        if u.sibling.color == RED:
+        p = u.parent
+        s = u.sibling
 
-            assert u.parent.color == BLACK
+        if s.color == RED:
 
-            u.sibling.color = BLACK
-            u.parent.color = RED
+            assert p.color == BLACK
 
-            if u.is_left_child():
-                self._left_rotate(u.parent)
+            s.color = BLACK
+            p.color = RED
+
+            if p.left is u:
+                self._left_rotate(p)
             else:
-                self._right_rotate(u.parent)
+                self._right_rotate(p)
 
             assert u.sibling.color == BLACK
 
         self._delete_case_3(u)
 
     def _delete_case_3(self, u: _RBTNode) -> None:
-        # Not sure if the children of u.sibling can be None.
-        if (u.parent.color == BLACK and u.sibling.color == BLACK and
-                ((u.sibling.left and u.sibling.left.color == BLACK) or
-                 not u.sibling.left) and
-                ((u.sibling.right and u.sibling.right.color == BLACK) or
-                 not u.sibling.right)):
-
-            u.sibling.color = RED
-            self._delete_case_1(u.parent)
+        p = u.parent
+        s = u.sibling
+        sl = s.left
+        sr = s.right
+
+        # Not sure if the children of s can be None.
+        if (p.color == BLACK and s.color == BLACK and
+                (sl is None or sl.color == BLACK) and
+                (sr is None or sr.color == BLACK)):
+
+            s.color = RED
+            self._delete_case_1(p)
         else:
             self._delete_case_4(u)
 
     def _delete_case_4(self, u: _RBTNode) -> None:
-        # Not sure if the children of u.sibling can be None.
-        if (u.parent.color == RED and u.sibling.color == BLACK and
-                ((u.sibling.left and u.sibling.left.color == BLACK) or
-                 not u.sibling.left) and
-                ((u.sibling.right and u.sibling.right.color == BLACK) or
-                 not u.sibling.right)):
-
-            u.sibling.color = RED
-            u.parent.color = BLACK
+        p = u.parent
+        s = u.sibling
+        sl = s.left
+        sr = s.right
+
+        # Not sure if the children of s can be None.
+        if (p.color == RED and s.color == BLACK and
+                (sl is None or sl.color == BLACK) and
+                (sr is None or sr.color == BLACK)):
+
+            s.color = RED
+            p.color = BLACK
         else:
             self._delete_case_5(u)
 
     def _delete_case_5(self, u: _RBTNode) -> None:
-        assert u.sibling is not None
+        p = u.parent
+        s = u.sibling
+
+        assert s is not None
 
-        if u.sibling.color == BLACK:
-            if (u.is_left_child() and
-                    (not u.sibling.right or u.sibling.right.color == BLACK) and
-                    u.sibling.left.color == RED):
+        if s.color == BLACK:
+            sl = s.left
+            sr = s.right
 
-                u.sibling.color = RED
-                u.sibling.left.color = BLACK
-                self._right_rotate(u.sibling)
+            if (p.left is u and
+                    (sr is None or sr.color == BLACK) and
+                    sl.color == RED):
 
-            elif (u.is_right_child() and
-                  (not u.sibling.left or u.sibling.left.color == BLACK) and
-                  u.sibling.right.color == RED):
+                s.color = RED
+                sl.color = BLACK
+                self._right_rotate(s)
 
-                u.sibling.color = RED
-                u.sibling.right.color = BLACK
-                self._left_rotate(u.sibling)
+            elif (p.right is u and
+                  (sl is None or sl.color == BLACK) and
+                  sr.color == RED):
+
+                s.color = RED
+                sr.color = BLACK
+                self._left_rotate(s)
 
         self._delete_case_6(u)
 
     def _delete_case_6(self, u: _RBTNode) -> None:
-        assert u.sibling is not None
+        p = u.parent
+        s = u.sibling
+
+        assert s is not None
 
-        u.sibling.color, u.parent.color = u.parent.color, u.sibling.color
+        s.color, p.color = p.color, s.color
 
-        if u.is_left_child():
-            assert u.sibling.right
-            u.sibling.right.color = BLACK
-            self._left_rotate(u.parent)
+        if p.left is u:
+            assert s.right
+            s.right.color = BLACK
+            self._left_rotate(p)
         else:
-            assert u.sibling.left
-            u.sibling.left.color = BLACK
-            self._right_rotate(u.parent)
+            assert s.left
+            s.left.color = BLACK
+            self._right_rotate(p)
 
     def remove_max(self) -> None:
         """Removes the greatest element from self.
@@ -544,9 +614,8 @@ class RBT(BST):
         Time complexity: O(log₂(n))."""
         assert is_rbt(self)
         if self._root is not None:
-            m = self.maximum()
-            assert m is not None
-            self.delete(m)
+            self._n -= 1
+            self._delete_node(self._maximum(self._root))
             assert is_rbt(self)
 
     def remove_min(self) -> None:
@@ -555,9 +624,8 @@ class RBT(BST):
         Time complexity: O(log₂(n))."""
         assert is_rbt(self)
         if self._root is not None:
-            m = self.minimum()
-            assert m is not None
-            self.delete(m)
+            self._n -= 1
+            self._delete_node(self._minimum(self._root))
             assert is_rbt(self)
 
 
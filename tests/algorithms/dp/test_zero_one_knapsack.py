@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+# Meta-info
+
+Author: Nelson Brochado
+
+Created: 15/10/2026
+
+Updated: 15/10/2026
+
+# Description
+
+Unit tests for the functions in the ands.algorithms.dp.zero_one_knapsack
+module.
+"""
+
+import sys
+import unittest
+from random import randint
+from unittest.mock import patch
+
+import numpy as np
+
+from ands.algorithms.dp import zero_one_knapsack as module
+from ands.algorithms.dp.zero_one_knapsack import *
+
+
+class TestZeroOneKnapsack(unittest.TestCase):
+    def test_no_items(self):
+        self.assertEqual(zero_one_knapsack(10, [], []), 0)
+
+    def test_total_weight_is_zero(self):
+        self.assertEqual(zero_one_knapsack(0, [1, 3, 4, 5], [1, 4, 5, 7]), 0)
+
+    def test_no_item_fits(self):
+        self.assertEqual(zero_one_knapsack(2, [3, 4, 5], [4, 5, 7]), 0)
+
+    def test_all_items_fit(self):
+        self.assertEqual(zero_one_knapsack(20, [1, 3, 4, 5], [1, 4, 5, 7]), 17)
+
+    def test_1(self):
+        self.assertEqual(zero_one_knapsack(7, [1, 3, 4, 5], [1, 4, 5, 7]), 9)
+
+    def test_2(self):
+        # Taking the most valuable item is not the optimal choice.
+        self.assertEqual(zero_one_knapsack(50, [10, 20, 30], [60, 100, 120]),
+                         220)
+
+    def test_profits_do_not_fit_into_int16(self):
+        self.assertEqual(zero_one_knapsack(5, [2, 3, 4], [30000, 30000, 5]),
+                         60000)
+
+    def test_profits_do_not_fit_into_int64(self):
+        self.assertEqual(
+            zero_one_knapsack(5, [2, 3, 4], [2 ** 63, 2 ** 63, 5]), 2 ** 64)
+
+    def test_numpy_int16_values(self):
+        values = np.array([20000, 20000, 5], dtype=np.int16)
+        self.assertEqual(zero_one_knapsack(5, [2, 3, 4], values), 40000)
+
+    def test_numpy_int64_values(self):
+        values = np.array([2 ** 62] * 3, dtype=np.int64)
+        self.assertEqual(zero_one_knapsack(5, [2, 3, 4], values), 2 ** 63)
+
+    def test_negative_value(self):
+        self.assertEqual(
+            zero_one_knapsack(5, [2, 3, 4], [20000, 20000, -10000]), 40000)
+        self.assertEqual(
+            zero_one_knapsack(5, [2, 3, 4], [30000, 30000, -60000]), 60000)
+
+    def test_negative_value_when_all_items_fit(self):
+        self.assertEqual(zero_one_knapsack(5, [2, 3], [-1, 5]), 5)
+        self.assertEqual(memoized_01_knapsack(5, [2, 3], [-1, 5]), 5)
+
+    def test_float_values(self):
+        self.assertEqual(zero_one_knapsack(3, [1, 2, 3], [1.5, 2.5, 3.5]), 4.0)
+
+    def test_float_values_when_all_items_fit(self):
+        self.assertEqual(zero_one_knapsack(6, [1, 2, 3], [1.5, 2.5, 3.5]), 7.5)
+
+    def test_random(self):
+        for _ in range(100):
+            n = randint(0, 10)
+            weights = [randint(1, 15) for _ in range(n)]
+            values = [randint(1, 30) for _ in range(n)]
+            total_weight = randint(0, 40)
+            self.assertEqual(
+                zero_one_knapsack(total_weight, weights, values),
+                recursive_01_knapsack(total_weight, weights, values))
+            self.assertEqual(
+                memoized_01_knapsack(total_weight, weights, values),
+                recursive_01_knapsack(total_weight, weights, values))
+
+    def test_random_with_non_positive_values(self):
+        for _ in range(100):
+            n = randint(0, 10)
+            weights = [randint(1, 15) for _ in range(n)]
+            values = [randint(-10, 30) for _ in range(n)]
+            total_weight = randint(0, 40)
+            self.assertEqual(
+                zero_one_knapsack(total_weight, weights, values),
+                recursive_01_knapsack(total_weight, weights, values))
+
+
+class TestZeroOneKnapsackBitset(unittest.TestCase):
+    def test_no_items(self):
+        self.assertEqual(zero_one_knapsack_bitset(10, []), 0)
+
+    def test_total_weight_is_zero(self):
+        self.assertEqual(zero_one_knapsack_bitset(0, [1, 3, 4, 5]), 0)
+
+    def test_exact_sum_is_reachable(self):
+        self.assertEqual(zero_one_knapsack_bitset(11, [2, 4, 9, 13]), 11)
+
+    def test_exact_sum_is_not_reachable(self):
+        self.assertEqual(zero_one_knapsack_bitset(10, [4, 4, 7]), 8)
+
+    def test_random(self):
+        for _ in range(100):
+            n = randint(0, 10)
+            weights = [randint(1, 15) for _ in range(n)]
+            total_weight = randint(0, 40)
+            self.assertEqual(zero_one_knapsack_bitset(total_weight, weights),
+                             zero_one_knapsack(total_weight, weights, weights))
+
+
+class TestMemoized01Knapsack(unittest.TestCase):
+    def test_float_values(self):
+        weights = [1, 2, 3]
+        values = [1.5, 2.5, 3.5]
+        self.assertEqual(memoized_01_knapsack(3, weights, values),
+                         recursive_01_knapsack(3, weights, values))
+        with patch.object(module, "_DENSE_STATES_THRESHOLD", 0):
+            self.assertEqual(memoized_01_knapsack(3, weights, values), 4.0)
+
+    def test_many_items(self):
+        # The top-down solution would exceed the recursion limit, so the
+        # subproblems must be solved bottom-up, even if they are many.
+        n = sys.getrecursionlimit()
+        weights = [randint(1, 20) for _ in range(n)]
+        values = [randint(1, 30) for _ in range(n)]
+        capacity = module._DENSE_STATES_THRESHOLD // n + 1
+        self.assertEqual(memoized_01_knapsack(capacity, weights, values),
+                         zero_one_knapsack(capacity, weights, values))
+
+    def test_top_down(self):
+        # Forces the subproblems to be solved top-down.
+        with patch.object(module, "_DENSE_STATES_THRESHOLD", 0):
+            self.assertEqual(
+                memoized_01_knapsack(7, [1, 3, 4, 5], [1, 4, 5, 7]), 9)
+            for _ in range(100):
+                n = randint(0, 10)
+                weights = [randint(1, 15) for _ in range(n)]
+                values = [randint(1, 30) for _ in range(n)]
+                total_weight = randint(0, 40)
+                self.assertEqual(
+                    memoized_01_knapsack(total_weight, weights, values),
+                    recursive_01_knapsack(total_weight, weights, values))
@@ -8,15 +8,18 @@ Author: Nelson Brochado
 
 Created: 13/02/2016
 
-Updated: 14/03/2017
+Updated: 15/10/2026
 
 # Description
 
 Unit tests for the classes and functions in the ands.ds.BST module.
 """
 
+import io
+import math
 import string
 import unittest
+from contextlib import redirect_stdout
 from random import randint, choice
 
 from ands.ds.BST import BST, _BSTNode
@@ -55,6 +58,38 @@ class TestBST(unittest.TestCase):
         for letter in string.printable:
             self.assertTrue(self.t.contains(letter))
 
+    def test_insert_many_when_key_is_None(self):
+        self.assertRaises(ValueError, self.t.insert_many, [3, None, 5])
+        self.assertTrue(self.t.is_empty())
+
+    def test_insert_many_sorted(self):
+        self.t.insert_many(range(300))
+        self.assertEqual(self.t.size, 300)
+        self.assertEqual(self.t.height(), math.ceil(math.log2(301)))
+        for i in range(300):
+            self.assertEqual(self.t.rank(i), i)
+
+    def test_insert_many_when_not_empty(self):
+        ls = [randint(-100, 100) for _ in range(50)]
+        for e in ls[:20]:
+            self.t.insert(e)
+        self.t.insert_many(ls[20:])
+        self.assertEqual(self.t.size, len(ls))
+        for e in ls:
+            self.assertTrue(self.t.contains(e))
+
+    def test_deep_tree(self):
+        # Inserting keys in sorted order one at a time degenerates a BST into a
+        # list, which is deeper than the default recursion limit.
+        n = 1200
+        for i in range(n):
+            self.t.insert(i)
+        self.assertTrue(self.t.contains(n - 1))
+        self.assertEqual(self.t.rank(n - 1), n - 1)
+        self.assertEqual(self.t.maximum(), n - 1)
+        self.t.delete(n // 2)
+        self.assertFalse(self.t.contains(n // 2))
+
     def test_contains_when_key_is_None(self):
         self.assertRaises(ValueError, self.t.contains, None)
 
@@ -91,6 +126,17 @@ class TestBST(unittest.TestCase):
             self.t.insert(e)
         self.assertEqual(self.t.rank(6), 1)
 
+    def test_rank_after_insertions_and_deletions(self):
+        ls = [randint(-50, 50) for _ in range(300)]
+        for e in ls:
+            self.t.insert(e)
+        for _ in range(150):
+            elem = choice(ls)
+            ls.remove(elem)
+            self.t.delete(elem)
+        for e in ls:
+            self.assertEqual(self.t.rank(e), sum(1 for x in ls if x < e))
+
     def test_height_when_tree_empty(self):
         self.assertEqual(self.t.height(), 0)
 
@@ -278,6 +324,58 @@ class TestBST(unittest.TestCase):
             self.t.insert(e)
         self.t.reverse_in_order_traversal()
 
+    def test_traversals_order(self):
+        ls = [randint(-100, 100) for _ in range(100)]
+        for e in ls:
+            self.t.insert(e)
+
+        def keys(traversal):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                traversal()
+            return [int(k) for k in out.getvalue().split(",")[:-1]]
+
+        self.assertEqual(keys(self.t.in_order_traversal), sorted(ls))
+        self.assertEqual(keys(self.t.reverse_in_order_traversal),
+                         sorted(ls, reverse=True))
+
+    def test_pre_and_post_order_traversals(self):
+        # Inserting the keys in level order produces the complete tree
+        #
+        #          8
+        #        /   \
+        #       4     12
+        #      / \   /  \
+        #     2   6 10  14
+        #
+        # without any rotation, if the tree is self-balancing.
+        for e in [8, 4, 12, 2, 6, 10, 14]:
+            self.t.insert(e)
+
+        def keys(traversal):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                traversal()
+            return [int(k) for k in out.getvalue().split(",")[:-1]]
+
+        self.assertEqual(keys(self.t.pre_order_traversal),
+                         [8, 4, 2, 6, 12, 10, 14])
+        self.assertEqual(keys(self.t.post_order_traversal),
+                         [2, 6, 4, 10, 14, 12, 8])
+
+    def test_str_when_empty_tree(self):
+        self.assertEqual(str(self.t), "Nothing to print: this BST is empty.")
+
+    def test_str(self):
+        for e in [10, 4, 85, 43, 6, 1, 69]:
+            self.t.insert(e)
+        s = str(self.t)
+        # Printing the tree does not modify it.
+        self.assertEqual(str(self.t), s)
+        for e in [10, 4, 85, 43, 6, 1, 69]:
+            self.assertIn(str(e), s)
+            self.assertTrue(self.t.contains(e))
+
 
 class TestBSTNode(unittest.TestCase):
     def test_create_when_key_None(self):
@@ -304,8 +402,8 @@ class TestBSTNode(unittest.TestCase):
 
     def test_when_no_parent(self):
         n = _BSTNode(12)
-        self.assertRaises(AttributeError, n.is_left_child)
-        self.assertRaises(AttributeError, n.is_right_child)
+        self.assertFalse(n.is_left_child())
+        self.assertFalse(n.is_right_child())
         self.assertIsNone(n.sibling)
         self.assertIsNone(n.grandparent)
         self.assertIsNone(n.uncle)
@@ -384,6 +482,19 @@ class TestBSTNode(unittest.TestCase):
         self.assertFalse(b.is_left_child())
         self.assertTrue(b.is_right_child())
 
+    def test_parent_and_side(self):
+        p = _BSTNode(12)
+        l = _BSTNode(14)
+        r = _BSTNode(28)
+        self.assertEqual(p.parent_and_side(), (None, False))
+
+        p.left = l
+        p.right = r
+        l.parent = p
+        r.parent = p
+        self.assertEqual(l.parent_and_side(), (p, True))
+        self.assertEqual(r.parent_and_side(), (p, False))
+
     def test_sibling(self):
         p = _BSTNode(12)
         l = _BSTNode(14)
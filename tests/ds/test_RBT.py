@@ -8,13 +8,15 @@ Author: Nelson Brochado
 
 Created: 15/02/2016
 
-Updated: 14/03/2017
+Updated: 15/10/2026
 
 # Description
 
 Unit tests for the classes and functions in the ands.ds.RBT module.
 """
 
+import math
+
 from ands.ds.RBT import RED, BLACK, RBT, _RBTNode
 from tests.ds.test_BST import TestBST, TestBSTNode
 
@@ -35,3 +37,12 @@ class TestRBTNode(TestBSTNode):
 class TestRBT(TestBST):
     def setUp(self):
         self.t = RBT()
+
+    def test_insert_many_sorted(self):
+        # Contrary to BST.insert_many, RBT.insert_many does not rebuild the
+        # tree, so only the height bound of red-black trees holds.
+        self.t.insert_many(range(300))
+        self.assertEqual(self.t.size, 300)
+        self.assertLessEqual(self.t.height(), 2 * math.log2(301))
+        for i in range(300):
+            self.assertEqual(self.t.rank(i), i)